@@ -1,6 +1,7 @@
 import sys
 import os
 import argparse
+import shutil
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
@@ -10,12 +11,14 @@ from src.email_client import send_email
 from src.rss_client import fetch_rss_items
 from src.image_generator import generate_infographic
 from src.history_manager import HistoryManager
+from src.concept_queue import ConceptQueue, concept_url
 
 console = Console()
 
 def main():
     parser = argparse.ArgumentParser(description="Arxiv to LinkedIn Agent")
     parser.add_argument("--email", action="store_true", help="Send the result via email instead of just printing")
+    parser.add_argument("--prerender-concepts", action="store_true", help="Render concept diagrams when the concept queue is refilled")
     args = parser.parse_args()
 
     console.print(Panel.fit("[bold blue]Arxiv to LinkedIn Agent[/bold blue]", subtitle="AI Research & News Content Generator"))
@@ -30,6 +33,7 @@ def main():
         
         generator = ContentGenerator()
         history = HistoryManager()
+        concept_queue = ConceptQueue()
         
         # --- PART 1: FETCH & FILTER CANDIDATES ---
         with console.status("[bold green]Fetching content candidates...[/bold green]"):
@@ -94,20 +98,38 @@ def main():
 
 
         # --- PART 3: AI CONCEPT INFOGRAPHIC ---
-        with console.status("[bold cyan]Generating AI Concept Concept...[/bold cyan]"):
-            concept_data = generator.generate_ai_concept()
+        if concept_queue.needs_refill():
+            try:
+                with console.status("[bold cyan]Refilling AI Concept queue...[/bold cyan]"):
+                    added = concept_queue.refill(generator, history, prerender=args.prerender_concepts)
+                console.print(f"[dim]Concept queue: {added} added -> {len(concept_queue)} queued[/dim]")
+            except Exception as e:
+                # Don't lose the run over a failed refill; use what's already queued
+                console.print(f"[bold yellow]Warning: Concept queue refill failed ({e}). {len(concept_queue)} concepts still queued.[/bold yellow]")
+
+        concept_data = concept_queue.peek()
+        from_queue = concept_data is not None
+        if not from_queue:
+            console.print("[bold yellow]Warning: Concept queue is empty! Generating a single concept.[/bold yellow]")
+            with console.status("[bold cyan]Generating AI Concept Concept...[/bold cyan]"):
+                concept_data = generator.generate_ai_concept(exclude_topics=history.get_titles("concept"))
         
         console.print(Panel(f"[bold]{concept_data['title']}[/bold]\n\n{concept_data['explanation']}\n\n[dim]Mermaid Code:[/dim]\n{concept_data['mermaid_code']}", title="AI Concept Generated", border_style="magenta"))
 
         infographic_path = "daily_concept.png"
-        with console.status("[bold magenta]Fetching Mermaid Diagram...[/bold magenta]"):
-            from src.image_generator import generate_mermaid_diagram
-            # We use the new mermaid generator
-            path = generate_mermaid_diagram(concept_data['mermaid_code'], infographic_path)
-            if path:
-                console.print(f"[bold green]Diagram saved to {infographic_path}[/bold green]")
-            else:
-                console.print("[bold red]Failed to generate diagram![/bold red]")
+        prerendered_path = concept_data.get('image_path')
+        if prerendered_path and os.path.exists(prerendered_path):
+            shutil.copyfile(prerendered_path, infographic_path)
+            console.print(f"[bold green]Pre-rendered diagram copied to {infographic_path}[/bold green]")
+        else:
+            with console.status("[bold magenta]Fetching Mermaid Diagram...[/bold magenta]"):
+                from src.image_generator import generate_mermaid_diagram
+                # We use the new mermaid generator
+                path = generate_mermaid_diagram(concept_data['mermaid_code'], infographic_path)
+                if path:
+                    console.print(f"[bold green]Diagram saved to {infographic_path}[/bold green]")
+                else:
+                    console.print("[bold red]Failed to generate diagram![/bold red]")
 
 
         # --- PART 4: EMAIL ---
@@ -147,8 +169,11 @@ DAILY AI CONCEPT
                     history.add_posted(best_paper.url, best_paper.title, "paper")
                 if best_news:
                     history.add_posted(best_news.url, best_news.title, "news")
-                # Concept doesn't have a URL per se, it's generated. We don't track it yet. 
-                # (Maybe track title? For now leave it).
+                # Concepts are tracked by topic so future batches skip them
+                if concept_data.get('topic'):
+                    history.add_posted(concept_url(concept_data['topic']), concept_data['topic'], "concept")
+                if from_queue:
+                    concept_queue.pop()
 
     except Exception as e:
         console.print(f"[bold red]An error occurred:[/bold red] {e}")
@@ -0,0 +1,124 @@
+import json
+import os
+import re
+from datetime import datetime
+
+from src.image_generator import generate_mermaid_diagram, validate_mermaid_code
+
+
+def concept_key(topic: str) -> str:
+    """
+    Normalizes a concept topic (e.g. "Low-Rank Adaptation (LoRA)") into a stable key
+    so the same concept is recognised regardless of casing or punctuation.
+    """
+    return re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")
+
+
+def concept_keys(topic: str) -> set:
+    """
+    All keys a topic is known by: the full name plus, for names like "Low-Rank Adaptation (LoRA)",
+    the parenthesised acronym and the name without it. This is best-effort; rewordings are
+    mainly kept out by the exclusion list in the generation prompt.
+    """
+    keys = {concept_key(topic)}
+    match = re.match(r"^(.*?)\s*\(([^)]*)\)\s*(.*)$", topic)
+    if match:
+        keys.add(concept_key(match.group(2)))
+        keys.add(concept_key(f"{match.group(1)} {match.group(3)}"))
+    keys.discard("")
+    return keys
+
+
+def concept_url(topic: str) -> str:
+    """
+    Concepts have no source URL, so we give them a pseudo-URL for the posted history.
+    """
+    return f"concept:{concept_key(topic)}"
+
+
+class ConceptQueue:
+    """
+    Local queue of pre-generated 'Concept of the Day' entries.
+    A single batched LLM call fills it with a few weeks of concepts; each daily run
+    then takes the next one without waiting on the LLM.
+    """
+    def __init__(self, queue_file="data/concept_queue.json", image_dir="data/concepts"):
+        self.queue_file = queue_file
+        self.image_dir = image_dir
+        self.queue = self._load_queue()
+        if not os.path.exists(self.queue_file):
+            # Always have a queue file on disk, even if the first refill fails
+            self._save_queue()
+
+    def _load_queue(self):
+        if not os.path.exists(self.queue_file):
+            return []
+        try:
+            with open(self.queue_file, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+    def _save_queue(self):
+        os.makedirs(os.path.dirname(self.queue_file), exist_ok=True)
+        with open(self.queue_file, 'w') as f:
+            json.dump(self.queue, f, indent=4)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def needs_refill(self, min_size=5):
+        return len(self.queue) < min_size
+
+    def topics(self):
+        return [entry['topic'] for entry in self.queue]
+
+    def peek(self):
+        return self.queue[0] if self.queue else None
+
+    def pop(self):
+        if not self.queue:
+            return None
+        entry = self.queue.pop(0)
+        self._save_queue()
+        image_path = entry.get('image_path')
+        if image_path and os.path.exists(image_path):
+            os.remove(image_path)
+        return entry
+
+    def refill(self, generator, history, count=21, prerender=False):
+        """
+        Generates a batch of concepts in one LLM call and appends the ones that pass
+        de-duplication and Mermaid validation. Returns the number of concepts added.
+        """
+        past_topics = history.get_titles("concept")
+        seen = set()
+        for topic in past_topics + self.topics():
+            seen |= concept_keys(topic)
+
+        candidates = generator.generate_ai_concepts_batch(count, exclude_topics=past_topics + self.topics())
+
+        added = 0
+        for concept in candidates:
+            key = concept_key(concept['topic'])
+            keys = concept_keys(concept['topic'])
+            if not keys or keys & seen:
+                continue
+            if not validate_mermaid_code(concept['mermaid_code']):
+                continue
+
+            if prerender:
+                image_path = os.path.join(self.image_dir, f"{key}.png")
+                os.makedirs(self.image_dir, exist_ok=True)
+                # mermaid.ink rejects broken syntax, so a failed render also drops the concept
+                if not generate_mermaid_diagram(concept['mermaid_code'], image_path):
+                    continue
+                concept['image_path'] = image_path
+
+            concept['date_generated'] = datetime.now().isoformat()
+            self.queue.append(concept)
+            seen |= keys
+            added += 1
+
+        self._save_queue()
+        return added
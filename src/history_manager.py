@@ -33,3 +33,6 @@ class HistoryManager:
         }
         self.history.append(entry)
         self._save_history()
+
+    def get_titles(self, type):
+        return [item['title'] for item in self.history if item.get('type') == type]
@@ -1,16 +1,38 @@
 import os
 import textwrap
 import base64
+import re
 import requests
 from PIL import Image, ImageDraw, ImageFont
 
+def validate_mermaid_code(mermaid_code: str) -> bool:
+    """
+    Cheap offline sanity check for LLM-written Mermaid code, so obviously broken
+    diagrams are rejected before they are queued or sent to mermaid.ink.
+    """
+    code = mermaid_code.strip()
+    if not re.match(r"^(graph|flowchart)\s+(TD|TB|BT|LR|RL)\b", code):
+        return False
+    # Quoted labels may legitimately contain brackets or keywords, so ignore their contents
+    code = re.sub(r'"[^"]*"', '""', code)
+    # The prompt asks for simple flowcharts; these constructs are the usual render failures
+    if re.search(r"\b(subgraph|linkStyle)\b", code):
+        return False
+    # Any common link operator (links with text, e.g. "-- Yes -->" or "-->|Yes|", contain one of these)
+    if not re.search(r"-->|---|==>|===|-\.->|-\.-|--o|--x", code):
+        return False
+    # Node labels must have balanced brackets
+    for open_char, close_char in ("[]", "()", "{}"):
+        if code.count(open_char) != code.count(close_char):
+            return False
+    return True
+
 def generate_mermaid_diagram(mermaid_code: str, output_path: str = "daily_concept.png"):
     """
     Converts Mermaid code to an image using mermaid.ink and saves it.
     """
     # 1. Sanitize Mermaid Code (Ensure newline after declaration)
     # Common issue: "graph TD A-->B" fails. Needs "graph TD\nA-->B"
-    import re
     # Pattern to find "graph TD" (or LR, etc) at the start, followed by anything that isn't a newline
     # We want to insert a newline after the direction.
     match = re.match(r"^\s*(graph\s+[A-Za-z]+)\s+(.*)", mermaid_code, re.DOTALL)
@@ -1,10 +1,53 @@
 import os
+import json
 import google.generativeai as genai
 from typing import List, Optional, Any
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared concept instructions; each caller adds its own selection line (one concept vs. a batch)
+CONCEPT_TOPIC_GUIDELINES = """
+        DO NOT choose basic concepts like "What is AI?", "Chatbots", or "Machine Learning vs AI".
+        INSTEAD, choose technical topics like:
+        - Low-Rank Adaptation (LoRA)
+        - Proximal Policy Optimization (PPO)
+        - Vision Transformers (ViT)
+        - Retrieval Augmented Generation (RAG) Architecture
+        - Latent Diffusion
+        - KV Cache
+        - Flash Attention
+        
+"""
+
+CONCEPT_CONTENT_GUIDELINES = """
+        1. A catchy Title (max 5-7 words).
+        2. A high-quality, educational LinkedIn post (150-200 words). 
+           - **Goal**: Teach the concept simply but deeply.
+           - **Style**: Start with a hook (why it matters). Use an ANALOGY if helpful. Break it down step-by-step.
+           - **Tone**: Professional, insightful, like a senior engineer mentoring a junior.
+           - Complement the diagram (mention "As shown in the diagram...").
+        3. A valid Mermaid.js graph definition (e.g., `graph TD; A-->B;`) that visually explains the concept.
+           - **CRITICAL**: Use semicolons (;) after EVERY statement.
+           - **KEEP IT SIMPLE**: Max 5-8 nodes. DO NOT use `subgraph` or `linkStyle`.
+           - Example: `graph TD; A[Input] --> B{Process}; B -- Yes --> C[Output]; B -- No --> D[Retrying];`
+           - Do not use special characters in node labels that break Mermaid syntax.
+        
+"""
+
+# Output budget for a concept batch: ~21 posts of ~200 words plus Mermaid code, with headroom
+CONCEPT_BATCH_MAX_OUTPUT_TOKENS = 32768
+
+def format_excluded_topics(topics: Optional[List[str]]) -> str:
+    """
+    Builds the prompt section listing concepts that were already covered.
+    """
+    if not topics:
+        return ""
+    prompt = "\nThese concepts have ALREADY been covered. Do NOT choose any of them (or a rewording of them):\n"
+    prompt += "\n".join(f"- {topic}" for topic in topics)
+    return prompt
+
 class ContentGenerator:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
@@ -78,47 +121,27 @@ class ContentGenerator:
         response = self.model.generate_content(prompt)
         return response.text
 
-    def generate_ai_concept(self) -> dict:
+    def generate_ai_concept(self, exclude_topics: Optional[List[str]] = None) -> dict:
         """
         Generates a 'Concept of the Day' with a title, explanation, and Mermaid diagram code.
+        The title doubles as the topic for the posted history (None if the response couldn't be parsed).
         """
         prompt = """
         Select a specific, **Intermediate to Advanced** technical concept from Artificial Intelligence, Machine Learning, or Generative AI.
-        
-        DO NOT choose basic concepts like "What is AI?", "Chatbots", or "Machine Learning vs AI".
-        INSTEAD, choose technical topics like:
-        - Low-Rank Adaptation (LoRA)
-        - Proximal Policy Optimization (PPO)
-        - Vision Transformers (ViT)
-        - Retrieval Augmented Generation (RAG) Architecture
-        - Latent Diffusion
-        - KV Cache
-        - Flash Attention
-        
-        Provide three things:
-        1. A catchy Title (max 5-7 words).
-        2. A high-quality, educational LinkedIn post (150-200 words). 
-           - **Goal**: Teach the concept simply but deeply.
-           - **Style**: Start with a hook (why it matters). Use an ANALOGY if helpful. Break it down step-by-step.
-           - **Tone**: Professional, insightful, like a senior engineer mentoring a junior.
-           - Complement the diagram (mention "As shown in the diagram...").
-        3. A valid Mermaid.js graph definition (e.g., `graph TD; A-->B;`) that visually explains the concept.
-           - **CRITICAL**: Use semicolons (;) after EVERY statement.
-           - **KEEP IT SIMPLE**: Max 5-8 nodes. DO NOT use `subgraph` or `linkStyle`.
-           - Example: `graph TD; A[Input] --> B{Process}; B -- Yes --> C[Output]; B -- No --> D[Retrying];`
-           - Do not use special characters in node labels that break Mermaid syntax.
-        
+        """ + CONCEPT_TOPIC_GUIDELINES + """
+        Provide three things:""" + CONCEPT_CONTENT_GUIDELINES + """
         Format the output EXACTLY like this (don't use markdown code blocks):
         TITLE: [The Title]
         EXPLANATION: [The Explanation text]
         MERMAID: [The Mermaid code, on one line or multiple lines]
-        """
+        """ + format_excluded_topics(exclude_topics)
         
         response = self.model.generate_content(prompt)
         text = response.text.strip()
         
         # Simple parsing
         title = "Unknown Concept"
+        topic = None
         explanation = "Check back tomorrow!"
         mermaid_code = "graph TD; A[Error] --> B[No Code];"
         
@@ -131,6 +154,7 @@ class ContentGenerator:
             
             if line.startswith("TITLE:"):
                 title = line.replace("TITLE:", "").strip()
+                topic = title
                 current_section = "title"
             elif line.startswith("EXPLANATION:"):
                 explanation = line.replace("EXPLANATION:", "").strip()
@@ -147,4 +171,60 @@ class ContentGenerator:
         # Clean up any markdown code blocks if the model ignored instructions
         mermaid_code = mermaid_code.replace("```mermaid", "").replace("```", "").strip()
         
-        return {"title": title, "explanation": explanation, "mermaid_code": mermaid_code}
+        return {"topic": topic, "title": title, "explanation": explanation, "mermaid_code": mermaid_code}
+
+    def generate_ai_concepts_batch(self, count: int, exclude_topics: Optional[List[str]] = None) -> List[dict]:
+        """
+        Generates several 'Concept of the Day' entries in a single request using structured (JSON) output.
+        Returns a list of dicts with topic, title, explanation and mermaid_code.
+        Raises ValueError if the response can't be parsed (e.g. truncated or blocked).
+        """
+        prompt = f"""
+        Select {count} DIFFERENT, **Intermediate to Advanced** technical concepts from Artificial Intelligence, Machine Learning, or Generative AI.
+        All {count} concepts must be distinct from each other.
+        """ + CONCEPT_TOPIC_GUIDELINES + """
+        For EACH concept, provide a "topic": the canonical name of the concept (e.g. "Low-Rank Adaptation (LoRA)", "KV Cache"),
+        plus these three things:""" + CONCEPT_CONTENT_GUIDELINES + format_excluded_topics(exclude_topics)
+
+        schema = {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "topic": {"type": "STRING"},
+                    "title": {"type": "STRING"},
+                    "explanation": {"type": "STRING"},
+                    "mermaid_code": {"type": "STRING"},
+                },
+                "required": ["topic", "title", "explanation", "mermaid_code"],
+            },
+        }
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=schema,
+                max_output_tokens=CONCEPT_BATCH_MAX_OUTPUT_TOKENS,
+            ),
+        )
+
+        try:
+            items = json.loads(response.text)
+        except (ValueError, AttributeError) as e:
+            # response.text raises ValueError when the response was blocked
+            raise ValueError(f"Could not parse concept batch response: {e}") from e
+        if not isinstance(items, list):
+            raise ValueError(f"Expected a JSON array of concepts, got {type(items).__name__}")
+
+        concepts = []
+        for item in items:
+            if not isinstance(item, dict) or not all(item.get(k) for k in ("topic", "title", "explanation", "mermaid_code")):
+                continue
+            mermaid_code = item["mermaid_code"].replace("```mermaid", "").replace("```", "").strip()
+            concepts.append({
+                "topic": item["topic"].strip(),
+                "title": item["title"].strip(),
+                "explanation": item["explanation"].strip(),
+                "mermaid_code": mermaid_code,
+            })
+        return concepts